@@ -0,0 +1,83 @@
+"""
+Authors: Nicholas Learman, Andrew Ballard
+Course: CS 481: Artificial Intelligence, Spring 2025
+Project: Lichess Chess Bot: Minimax with Alpha-Beta Pruning
+
+Guards the cold-start cost of the modules imported by process pool workers and CLI tools.
+Each module is imported in a fresh interpreter; the benchmark fails if it takes too long,
+uses too much memory, or pulls in any of the heavy GUI / Lichess client dependencies.
+
+    python benchmarks/bench_startup.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Modules that must stay cheap to import, since every worker process imports them
+MODULES = ["src.engine", "src.analysis"]
+
+# Dependencies that must only be loaded by the GUI and the Lichess bot
+HEAVY_MODULES = ["pandas", "numpy", "tkinter", "berserk", "requests"]
+
+IMPORT_TIME_BUDGET = 0.5  # seconds
+RSS_BUDGET = 48  # MB, including the interpreter itself
+RUNS = 5  # best of several runs to reduce noise
+
+# Run in a fresh interpreter so nothing is already imported or cached in memory
+MEASURE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+except ImportError:  # not available on Windows
+    rss_mb = None
+heavy = [m for m in json.loads(sys.argv[2]) if m in sys.modules]
+print(json.dumps({"elapsed": elapsed, "rss_mb": rss_mb, "heavy": heavy}))
+"""
+
+
+def measure(module: str) -> dict:
+    """Import the module in a new interpreter and return its import time, peak RSS and heavy imports"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE, module, json.dumps(HEAVY_MODULES)],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> int:
+    failed = False
+    for module in MODULES:
+        runs = [measure(module) for _ in range(RUNS)]
+        elapsed = min(run["elapsed"] for run in runs)
+        rss_mb = runs[0]["rss_mb"]
+        heavy = runs[0]["heavy"]
+
+        rss_text = f"{rss_mb:.1f} MB" if rss_mb is not None else "n/a"
+        print(f"{module}: import {elapsed * 1000:.1f} ms, peak RSS {rss_text}")
+
+        if elapsed > IMPORT_TIME_BUDGET:
+            print(f"  FAIL: import time over budget of {IMPORT_TIME_BUDGET * 1000:.0f} ms")
+            failed = True
+        if rss_mb is not None and rss_mb > RSS_BUDGET:
+            print(f"  FAIL: peak RSS over budget of {RSS_BUDGET} MB")
+            failed = True
+        if heavy:
+            print(f"  FAIL: imports heavy dependencies: {", ".join(heavy)}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Authors: Nicholas Learman, Andrew Ballard
+Course: CS 481: Artificial Intelligence, Spring 2025
+Project: Lichess Chess Bot: Minimax with Alpha-Beta Pruning
+
+Offline analysis of PGN game archives with MoveEngine, spread over all CPU cores.
+
+    python -m src.analysis games.pgn [more.pgn ...] --out analysis.jsonl --depth 3
+
+Writes one JSON line per move with the engine's best move, evaluations and centipawn loss.
+Evaluations are from the perspective of the side to move, as the bot itself searches.
+Re-running the same command after an interruption skips moves that were already analysed.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import time
+from multiprocessing import Pool
+from queue import SimpleQueue
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import chess
+import chess.pgn
+
+from src.engine import MoveEngine
+from src.search_cache import SearchCache
+
+# Moves losing at least this many centipawns against the engine's choice are flagged as blunders
+BLUNDER_CP_LOSS = 300
+
+# Scores at least this large (in pawns) come from a checkmate in the search
+MATE_THRESHOLD = 9000
+# Reported evaluations and centipawn losses are capped so mates do not swamp averages over an archive
+MAX_EVAL_CP = 10000
+MAX_CP_LOSS = 1000
+
+# Positions queued per worker; keeps memory bounded while streaming large archives
+TASKS_PER_WORKER = 64
+
+# Engine owned by each worker process, created by init_worker
+engine: Optional[MoveEngine] = None
+
+
+def init_worker(depth: int, cache_path: Optional[str]):
+    """Process pool initializer: builds one engine per worker process"""
+    global engine
+    cache = SearchCache(cache_path) if cache_path else None
+    engine = MoveEngine(depth=depth, cache=cache, verbose=False)
+
+
+def centipawns(score: float) -> int:
+    """Converts an engine score in pawns to centipawns, capping mate scores"""
+    return max(-MAX_EVAL_CP, min(MAX_EVAL_CP, round(score * 100)))
+
+
+def analyse_position(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Searches one position and scores the move that was played against the engine's best move"""
+    board = chess.Board(task["fen"])
+    played_move = chess.Move.from_uci(task["move"])
+    # Search as the side to move, exactly as the bot would when playing this position
+    engine.player_color = board.turn
+
+    best_move, best_score = engine.search(board)
+    if played_move == best_move:
+        played_score = best_score
+    else:
+        board.push(played_move)
+        played_score = engine.minimax(
+            board, engine.depth - 1, -math.inf, math.inf, False
+        )
+        board.pop()
+
+    eval_cp = centipawns(best_score)
+    played_eval_cp = centipawns(played_score)
+    cp_loss = min(MAX_CP_LOSS, max(0, eval_cp - played_eval_cp))
+
+    return {
+        "source": task["source"],
+        "game": task["game"],
+        "ply": task["ply"],
+        "fen": task["fen"],
+        "move": task["move"],
+        "turn": "white" if board.turn == chess.WHITE else "black",
+        "best_move": best_move.uci() if best_move else None,
+        "eval": eval_cp,
+        "played_eval": played_eval_cp,
+        "mate": abs(best_score) >= MATE_THRESHOLD
+        or abs(played_score) >= MATE_THRESHOLD,
+        "cp_loss": cp_loss,
+        "blunder": cp_loss >= BLUNDER_CP_LOSS,
+    }
+
+
+def read_positions(
+    pgn_paths: List[str], done: Set[Tuple[str, int, int]]
+) -> Iterator[Dict[str, Any]]:
+    """Streams one task per move, reading a single game at a time from each PGN file"""
+    for pgn_path in pgn_paths:
+        with open(pgn_path) as pgn:
+            for game_index in itertools.count():
+                game = chess.pgn.read_game(pgn)
+                if game is None:
+                    break
+
+                board = game.board()
+                for ply, move in enumerate(game.mainline_moves()):
+                    if (pgn_path, game_index, ply) not in done:
+                        yield {
+                            "source": pgn_path,
+                            "game": game_index,
+                            "ply": ply,
+                            "fen": board.fen(),
+                            "move": move.uci(),
+                        }
+                    board.push(move)
+
+
+def load_done(out_path: str) -> Set[Tuple[str, int, int]]:
+    """Collects moves already present in the output file so an interrupted run can resume.
+    A partially written last line is removed."""
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+
+    with open(out_path, "rb+") as out:
+        # Find the end of the last complete line, reading backwards from the end of the file
+        end = out.seek(0, os.SEEK_END)
+        complete = 0
+        position = end
+        while position > 0:
+            block_start = max(0, position - 4096)
+            out.seek(block_start)
+            newline = out.read(position - block_start).rfind(b"\n")
+            if newline != -1:
+                complete = block_start + newline + 1
+                break
+            position = block_start
+        if complete < end:
+            out.truncate(complete)
+
+        # Read the records one line at a time; the output grows with the archive
+        out.seek(0)
+        for line in out:
+            record = json.loads(line)
+            done.add((record["source"], record["game"], record["ply"]))
+    return done
+
+
+def analyse(
+    pgn_paths: List[str],
+    out_path: str,
+    depth: int = 3,
+    workers: Optional[int] = None,
+    cache_path: Optional[str] = None,
+):
+    """Analyses every move of the games in the PGN files, appending results to out_path"""
+    workers = workers or os.cpu_count()
+    done = load_done(out_path)
+    if done:
+        print(f"Resuming: {len(done)} moves already analysed")
+
+    if cache_path:
+        # Validate the shared cache once here rather than racing to clear it in every worker
+        MoveEngine(cache=SearchCache(cache_path), verbose=False).cache.close()
+
+    tasks = read_positions(pgn_paths, done)
+    finished = SimpleQueue()  # results and errors handed over by the pool's result thread
+    pending = 0
+    analysed = 0
+    blunders = 0
+    start_time = time.time()
+
+    with Pool(workers, initializer=init_worker, initargs=(depth, cache_path)) as pool:
+        # Line buffered so an interrupted run loses at most a partial line
+        with open(out_path, "a", buffering=1) as out:
+            while True:
+                # Tasks are queued from this thread, only while fewer than the limit are in flight,
+                # so nothing blocks the pool's own threads when the run is interrupted
+                if pending < workers * TASKS_PER_WORKER:
+                    task = next(tasks, None)
+                    if task is not None:
+                        pool.apply_async(
+                            analyse_position,
+                            (task,),
+                            callback=finished.put,
+                            error_callback=finished.put,
+                        )
+                        pending += 1
+                        continue
+                if pending == 0:
+                    break
+
+                record = finished.get()
+                pending -= 1
+                if isinstance(record, BaseException):
+                    raise record
+                out.write(json.dumps(record) + "\n")
+
+                analysed += 1
+                blunders += record["blunder"]
+                if analysed % 1000 == 0:
+                    rate = analysed / (time.time() - start_time)
+                    print(f"Analysed {analysed} moves ({rate:.1f}/s)")
+
+    elapsed = time.time() - start_time
+    print(f"Analysed {analysed} moves with {workers} workers in {elapsed:.1f}s")
+    print(f"Blunders found: {blunders}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse PGN games with MoveEngine")
+    parser.add_argument("pgn", nargs="+", help="PGN files to analyse")
+    parser.add_argument("--out", default="analysis.jsonl", help="JSONL output file")
+    parser.add_argument("--depth", type=int, default=3, help="Search depth")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: all cores)"
+    )
+    parser.add_argument(
+        "--cache", default=None, help="Persistent search cache file shared by workers"
+    )
+
+    args = parser.parse_args()
+    analyse(args.pgn, args.out, args.depth, args.workers, args.cache)
+
+
+if __name__ == "__main__":
+    main()
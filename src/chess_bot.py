@@ -4,23 +4,34 @@ Course: CS 481: Artificial Intelligence, Spring 2025
 Project: Lichess Chess Bot: Minimax with Alpha-Beta Pruning
 """
 
-import math
 import random
 import threading
 import time
+from datetime import datetime, timedelta
 from queue import Queue
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import berserk
 import berserk.exceptions
 import chess
-import pandas as pd
+
+from src.engine import MoveEngine
+from src.search_cache import SearchCache
+from src.telemetry import EventChannel
 
 
 class ChessBot:
     """Class to run our minimax with alpha-beta pruning chess bot on the Lichess API"""
 
-    def __init__(self, response: Dict[str, Any], client: berserk.Client):
+    def __init__(
+        self,
+        response: Dict[str, Any],
+        client: berserk.Client,
+        cache: Optional[SearchCache] = None,
+    ):
+        # Events for the GUI: status changes, engine search progress, clock and API latency
+        self.events = EventChannel()
+
         # Initialise with parameters from game creation
         self.id = response["id"]
         self.full_id = response["fullId"]
@@ -43,9 +54,9 @@ class ChessBot:
         self.is_active = (
             True  # Keep track of whether game is active to allow move making
         )
-        self.status = None
         self.status = "starting"
-        self.engine = MoveEngine(depth=4)
+        self.clock_remaining = None  # seconds left on our clock, once known
+        self.engine = MoveEngine(depth=4, cache=cache, events=self.events)
 
         # Initialize threads and thread communication objects
         self.move_made_event = threading.Event()
@@ -61,6 +72,33 @@ class ChessBot:
         self.best_move_thread = threading.Thread(target=self.best_move_controller)
         self.best_move_thread.start()
 
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @status.setter
+    def status(self, status: str):
+        """Status changes are sent to the GUI as soon as they happen"""
+        self._status = status
+        self.events.emit("status", status=status)
+
+    def update_clock(self, state: Dict[str, Any]):
+        """Record our remaining clock time from a game state event"""
+        if self.player_color is None:
+            return
+        clock = state.get("wtime" if self.player_color == "white" else "btime")
+        if clock is None:
+            return
+
+        # berserk may convert clock times to datetimes relative to the epoch
+        if isinstance(clock, datetime):
+            clock = clock - datetime(1970, 1, 1, tzinfo=clock.tzinfo)
+        if isinstance(clock, timedelta):
+            self.clock_remaining = clock.total_seconds()
+        else:
+            self.clock_remaining = clock / 1000
+        self.events.emit("clock", remaining=self.clock_remaining)
+
     def close(self):
         """Closes any bot game if active and stops threads"""
         print("Closing Game...")
@@ -109,7 +147,13 @@ class ChessBot:
             # Make a move
             while True:
                 try:
+                    request_start = time.monotonic()
                     self.client.bots.make_move(self.id, best_move)
+                    self.events.emit(
+                        "latency",
+                        request="make_move",
+                        seconds=time.monotonic() - request_start,
+                    )
                     break
                 except berserk.exceptions.ResponseError as re:
                     print(re)
@@ -172,9 +216,15 @@ class ChessBot:
             # Get info for popular database moves from the current position
             while True:
                 try:
+                    request_start = time.monotonic()
                     opening_statistics = self.client.opening_explorer.get_masters_games(
                         position=fen
                     )
+                    self.events.emit(
+                        "latency",
+                        request="opening_explorer",
+                        seconds=time.monotonic() - request_start,
+                    )
                     break
                 except berserk.exceptions.ResponseError as re:
                     if re.status_code == 429:
@@ -182,34 +232,38 @@ class ChessBot:
                         time.sleep(60)
 
             # Feature extraction from data
-            top_moves_data = pd.DataFrame(data=opening_statistics["moves"])
-            if len(top_moves_data) == 0:
-                return
-
-            top_moves_data["total"] = top_moves_data[["white", "draws", "black"]].sum(
-                axis=1
-            )
-            # Evaluate the percent chance that we win this game as opposed to our opponent (+ favors us, - favors opponent)
-            top_moves_data["eval"] = (
-                top_moves_data[self.player_color]
-                - top_moves_data[self.opponent_color(self.player_color)]
-            ) / top_moves_data["total"]
-
-            # Filter for only moves with fairly higher win percentage for our player and with a significant number of times it has been played
-            good_moves_data = top_moves_data[
-                (top_moves_data["eval"] > 0.05) & (top_moves_data["total"] > 10)
-            ]
-            good_moves_data = good_moves_data.sort_values(by="eval", ascending=False)
-            print(good_moves_data)
-            if len(good_moves_data) == 0:
+            good_moves = self.score_opening_moves(opening_statistics["moves"])
+            for move in good_moves:
+                print(f"{move["uci"]}: {move["total"]} games, eval {move["eval"]:.3f}")
+            if len(good_moves) == 0:
                 return
 
-            best_move = good_moves_data.iloc[0]["uci"]
+            best_move = good_moves[0]["uci"]
             print(f"Best move: {best_move}")
 
             self.best_move_message_queue.put(best_move)
             self.move_made_event.clear()
 
+    def score_opening_moves(self, moves: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Scores opening database moves for our player; returns the good moves, best first"""
+        good_moves = []
+        for move in moves:
+            total = move["white"] + move["draws"] + move["black"]
+            # Filter for only moves with a significant number of times it has been played
+            if total <= 10:
+                continue
+
+            # Evaluate the percent chance that we win this game as opposed to our opponent (+ favors us, - favors opponent)
+            score = (
+                move[self.player_color] - move[self.opponent_color(self.player_color)]
+            ) / total
+
+            # Filter for only moves with fairly higher win percentage for our player
+            if score > 0.05:
+                good_moves.append({**move, "total": total, "eval": score})
+
+        return sorted(good_moves, key=lambda move: move["eval"], reverse=True)
+
     def stream_game_state(self):
         """Stream the game state for responses such as game ending or move making"""
         print(f"Streaming game state on thread {self.game_stream_thread.getName()}")
@@ -232,6 +286,7 @@ class ChessBot:
                 case "gameState":
                     match event["status"]:
                         case "started":
+                            self.update_clock(event)
                             moves = event["moves"]
                             last_move = moves.split(" ")[-1]
                             # Update board state with new move
@@ -278,6 +333,8 @@ class ChessBot:
                                 self.engine.player_color = chess.BLACK
                             else:
                                 raise Exception("Unable to determine bot color!")
+                            self.events.emit("color", color=self.player_color)
+                            self.update_clock(event["state"])
 
                             # Set whos turn it is to start move control loop
                             self.is_my_turn = self.player_color == "white"
@@ -288,165 +345,3 @@ class ChessBot:
         """Get opponent color given our color"""
         opponent_colors = {"black": "white", "white": "black"}
         return opponent_colors.get(player_color)
-
-
-# Weighted value of each chess piece
-PIECE_VALUES = {
-    chess.PAWN: 1,
-    chess.KNIGHT: 3,
-    chess.BISHOP: 3,
-    chess.ROOK: 5,
-    chess.QUEEN: 9,
-    chess.KING: 0,
-}
-
-
-# TODO: continue to test MoveEngine or add other advanced moves to its playlist
-class MoveEngine:
-    def __init__(self, depth=3):  # depth of minimax tree
-        self.depth = depth
-        # store FEN strings of previous positions to penalize repeating moves
-        self.seen_fens = set()
-        self.player_color = None
-
-    def evaluate_board(self, board: chess.Board) -> float:
-        """assigns a value to the current board state. Positive is good for White, negative is good for Black."""
-        if board.is_checkmate():
-            return -9999 if board.turn else 9999
-        if board.is_stalemate() or board.is_insufficient_material():
-            return 0
-
-        # material evaluation; sum up piece values for both sides
-        score = sum(
-            PIECE_VALUES[piece_type]
-            * (
-                len(board.pieces(piece_type, self.player_color))
-                - len(board.pieces(piece_type, not self.player_color))
-            )
-            for piece_type in PIECE_VALUES
-        )
-
-        # mobility bonus to encourage more legal moves
-        mobility = board.legal_moves.count()
-        score += 0.1 * mobility if board.turn == self.player_color else -0.1 * mobility
-
-        # castling bonus for king safety
-        if board.has_kingside_castling_rights(
-            self.player_color
-        ) and board.has_queenside_castling_rights(self.player_color):
-            score += 0.3
-        if board.has_kingside_castling_rights(
-            not self.player_color
-        ) and board.has_queenside_castling_rights(not self.player_color):
-            score -= 0.3
-
-        # penalize repetition (same board position over and over)
-        if board.fen() in self.seen_fens:
-            score -= 2
-
-        # TODO: Add some incentive for pawn pushing in the endgame
-
-        # bonus for attacking undefended opponent pieces
-        for square, piece in board.piece_map().items():
-            if board.is_attacked_by(piece.color, square):
-                if not board.is_attacked_by(
-                    not piece.color, square
-                ):  # same as not defended
-                    score += 0.3 * PIECE_VALUES[piece.piece_type]
-
-        return score
-
-    def get_best_move(self, board: chess.Board) -> chess.Move:
-        """Main interface for the bot to decide its move; returns the best legal move based on minimax evaluation"""
-        maximizing = board.turn == self.player_color
-        alpha_beta = [-math.inf, math.inf]
-        best_score = alpha_beta[not maximizing]
-        best_move = None
-
-        # order moves to improve alpha-beta pruning efficiency
-        ordered_moves = self.order_moves(board)
-
-        for move in ordered_moves:
-            board.push(move)
-            # detects mate in 1
-            if board.is_checkmate():
-                board.pop()
-                print(f"Mate in 1 found: {move}")
-                return move
-            alpha_beta[not maximizing] = self.minimax(
-                board, self.depth - 1, alpha_beta[0], alpha_beta[1], not maximizing
-            )
-            board.pop()
-
-            # chooses the best move based on score value
-            if (maximizing and alpha_beta[not maximizing] > best_score) or (
-                not maximizing and alpha_beta[not maximizing] < best_score
-            ):
-                print(f"Evaluating: {move}, Score: {alpha_beta[not maximizing]:.2f}")
-                best_score = alpha_beta[not maximizing]
-                best_move = move
-            else:
-                print(f"Evaluating: {move}, Pruned")
-
-        if best_move:
-            self.seen_fens.add(board.fen())
-
-        print(f"Best move: {best_move}, Eval: {best_score:.2f}")
-        return best_move if best_move else random.choice(list(board.legal_moves))
-
-
-    def order_moves(self, board: chess.Board):
-        """returns moves sorted by heuristic: Highest priority is captures, then it does its checks and last makes a quiet move.
-        This method improves speed for search performance"""
-
-        def move_score(move: chess.Move):
-            if board.is_capture(move):
-                captured = board.piece_at(move.to_square)
-                return PIECE_VALUES.get(captured.piece_type, 0) if captured else 0
-            if board.gives_check(move):
-                return 0.5
-            return 0
-
-        return sorted(board.legal_moves, key=move_score, reverse=True)
-
-    def minimax(
-        self,
-        board: chess.Board,
-        depth: int,
-        alpha: float,
-        beta: float,
-        maximizing: bool,
-    ) -> float:
-        """minimax with alpha-beta pruning. Tries to maximize score for white and minimize for black"""
-        # Detect leaf nodes if at max depth
-        if depth == 0 or board.is_game_over():
-            return self.evaluate_board(board)
-
-        # improve search efficiency by trying promising moves first
-        ordered_moves = self.order_moves(board)
-        # acting as MAX: we want to maximize our bot,s utility
-        if maximizing:
-            for move in ordered_moves:
-                board.push(move)
-                alpha = max(
-                    alpha, self.minimax(board, depth - 1, alpha, beta, False)
-                )  # recursive call to next depth
-                board.pop()
-
-                if beta <= alpha:
-                    return beta
-
-            return alpha
-        # acting as MIN: we want to minimize our bot's utility
-        else:
-            for move in ordered_moves:
-                board.push(move)
-                beta = min(
-                    beta, self.minimax(board, depth - 1, alpha, beta, True)
-                )  # recursive call to next depth
-                board.pop()
-
-                if beta <= alpha:
-                    return alpha
-
-            return beta
@@ -0,0 +1,358 @@
+"""
+Authors: Nicholas Learman, Andrew Ballard
+Course: CS 481: Artificial Intelligence, Spring 2025
+Project: Lichess Chess Bot: Minimax with Alpha-Beta Pruning
+"""
+
+import json
+import math
+import os
+import random
+import time
+from typing import Dict, Optional, Tuple
+
+import chess
+import chess.polyglot
+
+from src.search_cache import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    SearchCache,
+    params_version,
+)
+from src.telemetry import EventChannel
+
+
+# Weighted value of each chess piece
+PIECE_VALUES = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9,
+    chess.KING: 0,
+}
+
+# Weights of the positional terms in MoveEngine.evaluate_board
+EVAL_WEIGHTS = {
+    "mobility": 0.1,
+    "castling": 0.3,
+    "hanging": 0.3,
+    "repetition": -2,
+}
+
+# Tuned evaluation parameters exported by src.tuning; loaded by MoveEngine if present
+DEFAULT_EVAL_PARAMS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "assets", "eval_params.json"
+)
+
+
+def load_eval_params(path: str) -> Tuple[Dict, Dict]:
+    """Load piece values and evaluation weights from a parameter file.
+    Missing entries fall back to the hand-picked defaults."""
+    piece_values = dict(PIECE_VALUES)
+    weights = dict(EVAL_WEIGHTS)
+    if not os.path.exists(path):
+        return piece_values, weights
+
+    with open(path) as f:
+        params = json.load(f)
+    for name, value in params.get("piece_values", {}).items():
+        piece_values[chess.PIECE_NAMES.index(name)] = value
+    weights.update(params.get("weights", {}))
+    print(f"Loaded evaluation parameters from {path}")
+    return piece_values, weights
+
+
+# Mixed into position keys so evaluations from each side's perspective are cached separately
+BLACK_PERSPECTIVE_KEY = 0x9D39247E33776D41
+# Mixed into position keys so static evaluations never collide with search results for the same position
+STATIC_EVAL_KEY = 0xF165B587DF898190
+
+
+# TODO: continue to test MoveEngine or add other advanced moves to its playlist
+class MoveEngine:
+    def __init__(
+        self,
+        depth=3,
+        cache: Optional[SearchCache] = None,
+        params_path: str = DEFAULT_EVAL_PARAMS_PATH,
+        verbose: bool = True,
+        events: Optional[EventChannel] = None,
+    ):  # depth of minimax tree
+        self.depth = depth
+        self.verbose = verbose  # print the evaluation of each root move
+        self.piece_values, self.weights = load_eval_params(params_path)
+        # store FEN strings of previous positions to penalize repeating moves
+        self.seen_fens = set()
+        self.player_color = None
+        # number of repetition penalties applied; searches that include one are not cached
+        self.repetitions_seen = 0
+
+        # optional persistent cache shared between games; cleared if our evaluation has changed
+        self.cache = cache
+        if self.cache:
+            self.cache.ensure_version(params_version(self.piece_values, self.weights))
+
+        # live search statistics, reported to the GUI through the event channel if one is given
+        self.events = events
+        self.nodes = 0
+        self.search_start = time.monotonic()
+        self.root_move_number = 0
+        self.root_move_count = 0
+        # best line found below each ply of the current search
+        self.pv = [[] for _ in range(self.depth + 1)]
+        self.principal_variation = []
+
+    def report_search(self, done: bool = False):
+        """Send the current search statistics to the event channel; progress updates are throttled"""
+        if not self.events:
+            return
+        elapsed = time.monotonic() - self.search_start
+        emit = self.events.emit if done else self.events.emit_throttled
+        emit(
+            "search",
+            depth=self.depth,
+            move_number=self.root_move_number,
+            move_count=self.root_move_count,
+            nodes=self.nodes,
+            nodes_per_second=self.nodes / elapsed if elapsed > 0 else 0,
+            elapsed=elapsed,
+            pv=[move.uci() for move in self.principal_variation],
+            done=done,
+        )
+
+    def position_key(self, board: chess.Board) -> int:
+        """Zobrist hash of the board from the perspective of our player, used to index the search cache"""
+        key = chess.polyglot.zobrist_hash(board)
+        return key ^ BLACK_PERSPECTIVE_KEY if self.player_color == chess.BLACK else key
+
+    def evaluate_board(self, board: chess.Board) -> float:
+        """assigns a value to the current board state. Positive is good for White, negative is good for Black."""
+        score = None
+        if self.cache:
+            key = self.position_key(board) ^ STATIC_EVAL_KEY
+            entry = self.cache.probe(key)
+            if entry is not None and entry[1] == 0 and entry[2] == EXACT:
+                score = entry[0]
+        if score is None:
+            score = self.static_evaluation(board)
+            if self.cache:
+                self.cache.store(key, score, 0, EXACT)
+
+        # penalize repetition (same board position over and over); depends on this game so it is never cached
+        if board.fen() in self.seen_fens:
+            score += self.weights["repetition"]
+            self.repetitions_seen += 1
+
+        return score
+
+    def static_evaluation(self, board: chess.Board) -> float:
+        """evaluation terms that depend only on the position itself"""
+        if board.is_checkmate():
+            return -9999 if board.turn == self.player_color else 9999
+        if board.is_stalemate() or board.is_insufficient_material():
+            return 0
+
+        # material evaluation; sum up piece values for both sides
+        score = sum(
+            self.piece_values[piece_type]
+            * (
+                len(board.pieces(piece_type, self.player_color))
+                - len(board.pieces(piece_type, not self.player_color))
+            )
+            for piece_type in self.piece_values
+        )
+
+        # mobility bonus to encourage more legal moves
+        mobility = board.legal_moves.count()
+        score += (
+            self.weights["mobility"] * mobility
+            if board.turn == self.player_color
+            else -self.weights["mobility"] * mobility
+        )
+
+        # castling bonus for king safety
+        if board.has_kingside_castling_rights(
+            self.player_color
+        ) and board.has_queenside_castling_rights(self.player_color):
+            score += self.weights["castling"]
+        if board.has_kingside_castling_rights(
+            not self.player_color
+        ) and board.has_queenside_castling_rights(not self.player_color):
+            score -= self.weights["castling"]
+
+        # TODO: Add some incentive for pawn pushing in the endgame
+
+        # bonus for attacking undefended opponent pieces
+        for square, piece in board.piece_map().items():
+            if board.is_attacked_by(piece.color, square):
+                if not board.is_attacked_by(
+                    not piece.color, square
+                ):  # same as not defended
+                    score += (
+                        self.weights["hanging"] * self.piece_values[piece.piece_type]
+                    )
+
+        return score
+
+    def get_best_move(self, board: chess.Board) -> chess.Move:
+        """Main interface for the bot to decide its move; returns the best legal move based on minimax evaluation"""
+        best_move, best_score = self.search(board)
+
+        if best_move:
+            self.seen_fens.add(board.fen())
+
+        if self.verbose:
+            print(f"Best move: {best_move}, Eval: {best_score:.2f}")
+        return best_move if best_move else random.choice(list(board.legal_moves))
+
+    def search(self, board: chess.Board) -> Tuple[Optional[chess.Move], float]:
+        """Runs minimax from the root position; returns the best move and its score for our player"""
+        maximizing = board.turn == self.player_color
+        alpha_beta = [-math.inf, math.inf]
+        best_score = alpha_beta[not maximizing]
+        best_move = None
+
+        self.nodes = 0
+        self.search_start = time.monotonic()
+        self.pv = [[] for _ in range(self.depth + 1)]
+        self.principal_variation = []
+
+        # order moves to improve alpha-beta pruning efficiency
+        ordered_moves = self.order_moves(board)
+        self.root_move_count = len(ordered_moves)
+
+        for self.root_move_number, move in enumerate(ordered_moves, start=1):
+            board.push(move)
+            # detects mate in 1
+            if board.is_checkmate():
+                board.pop()
+                if self.verbose:
+                    print(f"Mate in 1 found: {move}")
+                self.principal_variation = [move]
+                self.report_search(done=True)
+                return move, 9999 if maximizing else -9999
+            alpha_beta[not maximizing] = self.minimax(
+                board, self.depth - 1, alpha_beta[0], alpha_beta[1], not maximizing
+            )
+            board.pop()
+
+            # chooses the best move based on score value
+            if (maximizing and alpha_beta[not maximizing] > best_score) or (
+                not maximizing and alpha_beta[not maximizing] < best_score
+            ):
+                if self.verbose:
+                    print(
+                        f"Evaluating: {move}, Score: {alpha_beta[not maximizing]:.2f}"
+                    )
+                best_score = alpha_beta[not maximizing]
+                best_move = move
+                self.principal_variation = [move] + self.pv[1]
+            elif self.verbose:
+                print(f"Evaluating: {move}, Pruned")
+            self.report_search()
+
+        self.report_search(done=True)
+        return best_move, best_score
+
+    def order_moves(self, board: chess.Board):
+        """returns moves sorted by heuristic: Highest priority is captures, then it does its checks and last makes a quiet move.
+        This method improves speed for search performance"""
+
+        def move_score(move: chess.Move):
+            if board.is_capture(move):
+                captured = board.piece_at(move.to_square)
+                return PIECE_VALUES.get(captured.piece_type, 0) if captured else 0
+            if board.gives_check(move):
+                return 0.5
+            return 0
+
+        return sorted(board.legal_moves, key=move_score, reverse=True)
+
+    def minimax(
+        self,
+        board: chess.Board,
+        depth: int,
+        alpha: float,
+        beta: float,
+        maximizing: bool,
+    ) -> float:
+        """minimax with alpha-beta pruning. Tries to maximize score for white and minimize for black"""
+        ply = self.depth - depth
+        self.pv[ply] = []
+        self.nodes += 1
+        if self.nodes % 256 == 0:
+            self.report_search()
+
+        # Detect leaf nodes if at max depth
+        if depth == 0 or board.is_game_over():
+            return self.evaluate_board(board)
+
+        # reuse a result from an earlier search of this position at the same or greater depth
+        if self.cache:
+            key = self.position_key(board)
+            entry = self.cache.probe(key)
+            if entry is not None and entry[1] >= depth:
+                score, _, bound = entry
+                if bound == EXACT:
+                    return min(max(score, alpha), beta)
+                if bound == LOWER_BOUND and score >= beta:
+                    return beta
+                if bound == UPPER_BOUND and score <= alpha:
+                    return alpha
+        alpha_start, beta_start = alpha, beta
+        repetitions_start = self.repetitions_seen
+
+        # improve search efficiency by trying promising moves first
+        ordered_moves = self.order_moves(board)
+        # acting as MAX: we want to maximize our bot,s utility
+        if maximizing:
+            for move in ordered_moves:
+                board.push(move)
+                score = self.minimax(
+                    board, depth - 1, alpha, beta, False
+                )  # recursive call to next depth
+                board.pop()
+
+                if score > alpha:
+                    alpha = score
+                    self.pv[ply] = [move] + self.pv[ply + 1]
+
+                if beta <= alpha:
+                    alpha = beta
+                    break
+
+            result = alpha
+        # acting as MIN: we want to minimize our bot's utility
+        else:
+            for move in ordered_moves:
+                board.push(move)
+                score = self.minimax(
+                    board, depth - 1, alpha, beta, True
+                )  # recursive call to next depth
+                board.pop()
+
+                if score < beta:
+                    beta = score
+                    self.pv[ply] = [move] + self.pv[ply + 1]
+
+                if beta <= alpha:
+                    beta = alpha
+                    break
+
+            result = beta
+
+        # results at the edge of the search window are only bounds on the true value;
+        # results that include this game's repetition penalty must not be shared with other games
+        if self.cache and self.repetitions_seen == repetitions_start:
+            if result <= alpha_start:
+                bound = UPPER_BOUND
+            elif result >= beta_start:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            self.cache.store(key, result, depth, bound)
+
+        return result
@@ -8,13 +8,16 @@ import os
 import tkinter as tk
 import webbrowser
 from tkinter import messagebox, ttk
+from typing import TYPE_CHECKING
 
-import berserk
-import berserk.exceptions
-import requests
-from dotenv import load_dotenv
+from src.search_cache import SearchCache
 
-from src.chess_bot import ChessBot
+# The bot and the Lichess client libraries (berserk, requests) are imported at first use so the window opens quickly
+if TYPE_CHECKING:
+    from src.chess_bot import ChessBot
+
+# Milliseconds between draining events from the bot; fast enough that updates appear immediately
+EVENT_POLL_INTERVAL = 50
 
 
 class ChessGUI:
@@ -33,11 +36,15 @@ class ChessGUI:
 
         # Info about active game
         self.active_game = False
-        self.active_game_bot: ChessBot = None
+        self.active_game_bot: "ChessBot" = None
+        self.event_loop_id = None
+        self.search_cache = None
 
         self.root_grid_layout()
 
-        self.connect_to_lichess()
+        # Connect once the window is showing
+        self.root.after(0, self.connect_to_lichess)
+        self.root.after(0, self.open_search_cache)
 
         self.root.mainloop()  # Run GUI
 
@@ -50,8 +57,10 @@ class ChessGUI:
                 "Are you sure you want to exit? A game is still active and will be resigned if you leave now.",
             ):
                 self.active_game_bot.close()
+                self.close_search_cache()
                 self.root.destroy()
         else:
+            self.close_search_cache()
             self.root.destroy()
 
     def configure_root(self):
@@ -167,6 +176,8 @@ class ChessGUI:
         self.ai_difficulty_label.grid(row=2, column=1, pady=5, sticky="nsew")
         self.player_color_label.grid(row=3, column=1, pady=5, sticky="nsew")
         self.link_button.grid(row=4, column=1, pady=5, sticky="nsew")
+        self.create_telemetry_frame()
+        self.telemetry_frame.grid(row=5, column=1, pady=5, sticky="nsew")
 
         self.game_info_frame.grid(row=1, column=1, sticky="nsew")
         self.game_info_frame.grid_columnconfigure(1, weight=1)
@@ -187,44 +198,84 @@ class ChessGUI:
 
         self.status_label.configure(**configs)
 
-    def start_status_watcher(self):
-        """Starts callbacks to watch for game status updates"""
-        self.last_status = None
-        self.watch_status_loop()
-
-    def watch_status_loop(self):
-        """Repeatedly check the status of the game and update the status display"""
-        current_status = self.active_game_bot.status
+    def create_telemetry_frame(self):
+        """Creates a frame showing live statistics of the engine's search and the Lichess API"""
+        self.telemetry_frame = ttk.Labelframe(
+            self.game_info_frame, text="Engine", borderwidth=2, relief="solid", padding=5
+        )
 
-        if current_status != self.last_status:
-            self.last_status = current_status
-            self.status_var.set(current_status.capitalize())
+        self.depth_var = tk.StringVar(self.telemetry_frame, value="Depth: -")
+        self.speed_var = tk.StringVar(self.telemetry_frame, value="Speed: -")
+        self.pv_var = tk.StringVar(self.telemetry_frame, value="Best Line: -")
+        self.time_var = tk.StringVar(self.telemetry_frame, value="Search Time: -")
+        self.latency_var = tk.StringVar(self.telemetry_frame, value="API Latency: -")
+
+        for row, variable in enumerate(
+            [
+                self.depth_var,
+                self.speed_var,
+                self.pv_var,
+                self.time_var,
+                self.latency_var,
+            ],
+            start=1,
+        ):
+            ttk.Label(
+                self.telemetry_frame, textvariable=variable, wraplength=220
+            ).grid(row=row, column=1, sticky="w")
+
+    def show_search(self, search: dict):
+        """Update the telemetry frame with the latest search statistics"""
+        progress = (
+            "done"
+            if search["done"]
+            else f"move {search["move_number"]}/{search["move_count"]}"
+        )
+        self.depth_var.set(f"Depth: {search["depth"]} ({progress})")
+        self.speed_var.set(
+            f"Speed: {search["nodes_per_second"]:,.0f} nodes/s ({search["nodes"]:,} nodes)"
+        )
+        self.pv_var.set(f"Best Line: {" ".join(search["pv"]) or "-"}")
+
+        clock = ""
+        if self.clock_remaining is not None:
+            minutes, seconds = divmod(int(self.clock_remaining), 60)
+            clock = f" of {minutes}:{seconds:02d} left"
+        self.time_var.set(f"Search Time: {search["elapsed"]:.1f}s{clock}")
+
+    def start_event_loop(self):
+        """Starts handling events from the active game's ChessBot, replacing the loop of any previous game"""
+        if self.event_loop_id:
+            self.root.after_cancel(self.event_loop_id)
+        self.clock_remaining = None
+        self.event_loop()
+
+    def event_loop(self):
+        """Drain events sent by the bot and engine threads and update the display on the GUI thread.
+        Only the latest search update of each batch is drawn so a fast search cannot flood the GUI."""
+        latest_search = None
+        for kind, data in self.active_game_bot.events.drain():
+            match kind:
+                case "status":
+                    self.status_var.set(data["status"].capitalize())
+                case "color":
+                    self.player_color_label.configure(
+                        text=f"Player Color: {data["color"].capitalize()}"
+                    )
+                case "clock":
+                    self.clock_remaining = data["remaining"]
+                case "latency":
+                    self.latency_var.set(
+                        f"API Latency: {data["seconds"] * 1000:.0f} ms ({data["request"]})"
+                    )
+                case "search":
+                    latest_search = data
+
+        if latest_search:
+            self.show_search(latest_search)
 
         # Schedule the next check (non-blocking)
-        self.root.after(1000, self.watch_status_loop)  # every 1 second
-
-    def start_color_watcher(self):
-        """Starts callbacks to watch for player color.
-        Required when player color is set to random."""
-        self.last_color = None
-        self.watch_color_loop()
-
-    def watch_color_loop(self):
-        """Look for player color value from ChessBot, updates the display when it is found, and breaks the loop"""
-        current_color = self.active_game_bot.player_color
-
-        if current_color != self.last_color and current_color is not None:
-            self.last_color = current_color
-            self.player_color_label.configure(
-                text=f"Player Color: {current_color.capitalize()}"
-            )
-        else:
-            self.root.after(1000, self.watch_color_loop)  # every 1 second
-
-    def start_watchers(self):
-        """Starts callbacks to watch for active game settings"""
-        self.start_status_watcher()
-        self.start_color_watcher()
+        self.event_loop_id = self.root.after(EVENT_POLL_INTERVAL, self.event_loop)
 
     def root_grid_layout(self):
         """Grid layout for root window"""
@@ -238,6 +289,10 @@ class ChessGUI:
     # Non-gui Functions
     def connect_to_lichess(self):
         """Connect to the Lichess API using berserk client"""
+        import berserk
+        import requests
+        from dotenv import load_dotenv
+
         load_dotenv()
         self.LICHESS_HOST = os.getenv("LICHESS_HOST", "https://lichess.org")
         secret_key = os.getenv("SECRET_KEY")
@@ -253,6 +308,20 @@ class ChessGUI:
 
         self.client = berserk.Client(session=session)
 
+    def open_search_cache(self):
+        """Open the persistent search cache shared by all games, if a path is configured in the .env file"""
+        self.search_cache = None
+        cache_path = os.getenv("SEARCH_CACHE_PATH")
+        if cache_path:
+            self.search_cache = SearchCache(
+                cache_path, size_mb=int(os.getenv("SEARCH_CACHE_MB", "64"))
+            )
+
+    def close_search_cache(self):
+        """Flush and close the persistent search cache"""
+        if self.search_cache:
+            self.search_cache.close()
+
     def play_ai(self):
         """Start a game against the LiChess AI"""
 
@@ -273,6 +342,8 @@ class ChessGUI:
 
     def create_ai(self):
         """Wrapper for the Lichess API call. Waits to create a game if encountering API rate limiting."""
+        import berserk.exceptions
+
         args = {
             "level": self.ai_difficulty.get(),
             "clock_limit": 3600,
@@ -297,12 +368,14 @@ class ChessGUI:
         webbrowser.open(url)
 
         # Create the chess bot (automatically starts on creation)
-        self.active_game_bot = ChessBot(response, self.client)
+        from src.chess_bot import ChessBot
+
+        self.active_game_bot = ChessBot(response, self.client, self.search_cache)
         self.active_game = True
 
-        # Create GUI elements and watchers to display the active game
+        # Create GUI elements and start handling events to display the active game
         self.create_game_info_frame(url, args["level"], args["color"])
-        self.start_watchers()
+        self.start_event_loop()
 
 
 def main():
@@ -0,0 +1,174 @@
+"""
+Authors: Nicholas Learman, Andrew Ballard
+Course: CS 481: Artificial Intelligence, Spring 2025
+Project: Lichess Chess Bot: Minimax with Alpha-Beta Pruning
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Optional, Tuple
+
+# Bound types for stored search results
+EXACT = 0
+LOWER_BOUND = 1  # search failed high; true value is >= stored score
+UPPER_BOUND = 2  # search failed low; true value is <= stored score
+
+# File header: magic, format version, evaluation params version, bucket count
+HEADER = struct.Struct("<4sIQQ")
+HEADER_SIZE = 64  # header is padded so buckets start page-friendly
+MAGIC = b"CBTT"
+FORMAT_VERSION = 2
+
+# Slot: checked key, score, depth, bound; key is stored XORed with the data word
+# so a slot torn by a concurrent writer in another process reads as a miss
+SLOT = struct.Struct("<QfbBxx")
+DATA = struct.Struct("<fbBxx")
+SLOTS_PER_BUCKET = 4
+BUCKET_SIZE = SLOT.size * SLOTS_PER_BUCKET
+
+
+def params_version(piece_values: dict, weights: dict) -> int:
+    """Returns a 64 bit fingerprint of the evaluation parameters used to fill a cache"""
+    encoded = json.dumps(
+        {
+            "piece_values": {str(k): v for k, v in piece_values.items()},
+            "weights": weights,
+        },
+        sort_keys=True,
+    ).encode()
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "little")
+
+
+class SearchCache:
+    """Persistent, fixed-size transposition table backed by a memory-mapped file.
+
+    Entries are grouped into buckets of a few slots indexed by the position's Zobrist hash.
+    The file is only paged in by the OS as buckets are touched, so opening a large cache is instant.
+    Several games and processes may share one file; all writes are single slot stores."""
+
+    def __init__(self, path: str, size_mb: int = 64, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+        self.hits = 0
+        self.misses = 0
+
+        if readonly:
+            self.file = open(path, "rb")
+            self.created = False
+        else:
+            # Create a sparse file of the requested size on first use
+            self.file = open(path, "a+b")
+            # A new file is already all zeros, so it only needs a header and never has to be cleared
+            self.created = os.path.getsize(path) == 0
+            if os.path.getsize(path) < HEADER_SIZE + BUCKET_SIZE:
+                self.file.truncate(HEADER_SIZE + size_mb * 1024 * 1024)
+        file_size = os.path.getsize(path)
+        self.bucket_count = (file_size - HEADER_SIZE) // BUCKET_SIZE
+
+        self.map = mmap.mmap(
+            self.file.fileno(),
+            HEADER_SIZE + self.bucket_count * BUCKET_SIZE,
+            access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE,
+        )
+        self.version = None
+        self.enabled = True
+
+    def close(self):
+        """Flushes pending writes and unmaps the cache file"""
+        if not self.readonly:
+            self.map.flush()
+        self.map.close()
+        self.file.close()
+
+    def ensure_version(self, version: int):
+        """Invalidates the whole cache if it was filled with different evaluation parameters.
+        A read-only cache with a mismatched version is disabled instead."""
+        self.version = version
+        magic, fmt, stored_version, buckets = HEADER.unpack_from(self.map, 0)
+        if (
+            magic == MAGIC
+            and fmt == FORMAT_VERSION
+            and stored_version == version
+            and buckets == self.bucket_count
+        ):
+            self.enabled = True
+            return
+
+        if self.readonly:
+            print("Search cache version mismatch! Cache disabled.")
+            self.enabled = False
+            return
+
+        if not self.created:
+            print("Search cache built with other evaluation parameters! Clearing...")
+            # Zero the table in chunks to avoid allocating the whole file in memory
+            chunk = bytes(1024 * 1024)
+            offset = HEADER_SIZE
+            end = HEADER_SIZE + self.bucket_count * BUCKET_SIZE
+            while offset < end:
+                size = min(len(chunk), end - offset)
+                self.map[offset : offset + size] = chunk[:size]
+                offset += size
+        self.created = False
+        HEADER.pack_into(
+            self.map, 0, MAGIC, FORMAT_VERSION, version, self.bucket_count
+        )
+        self.enabled = True
+
+    def _bucket_offset(self, key: int) -> int:
+        return HEADER_SIZE + (key % self.bucket_count) * BUCKET_SIZE
+
+    def _read_slot(self, slot_offset: int) -> Tuple[Optional[int], float, int, int]:
+        """Decodes a slot into (key, score, depth, bound); key is None for an empty slot"""
+        checked_key, score, depth, bound = SLOT.unpack_from(self.map, slot_offset)
+        data_word = int.from_bytes(
+            self.map[slot_offset + 8 : slot_offset + SLOT.size], "little"
+        )
+        if not checked_key and not data_word:
+            return None, 0.0, 0, EXACT
+        return checked_key ^ data_word, score, depth, bound
+
+    def probe(self, key: int) -> Optional[Tuple[float, int, int]]:
+        """Returns (score, depth, bound) stored for the key, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        offset = self._bucket_offset(key)
+        for i in range(SLOTS_PER_BUCKET):
+            slot_key, score, depth, bound = self._read_slot(offset + i * SLOT.size)
+            if slot_key == key:
+                self.hits += 1
+                return score, depth, bound
+
+        self.misses += 1
+        return None
+
+    def store(self, key: int, score: float, depth: int, bound: int):
+        """Stores a result, replacing the same position or else the shallowest entry in its bucket"""
+        if not self.enabled or self.readonly:
+            return
+
+        offset = self._bucket_offset(key)
+        replace_offset = offset
+        replace_depth = float("inf")
+        for i in range(SLOTS_PER_BUCKET):
+            slot_offset = offset + i * SLOT.size
+            slot_key, _, slot_depth, _ = self._read_slot(slot_offset)
+            if slot_key == key:
+                # Never overwrite a deeper result for the same position
+                if slot_depth > depth:
+                    return
+                replace_offset = slot_offset
+                break
+            if slot_key is None:
+                slot_depth = -1  # empty slots are always the first choice
+            if slot_depth < replace_depth:
+                replace_offset, replace_depth = slot_offset, slot_depth
+
+        data = DATA.pack(score, max(-128, min(127, depth)), bound)
+        self.map[replace_offset : replace_offset + SLOT.size] = (
+            struct.pack("<Q", key ^ int.from_bytes(data, "little")) + data
+        )
@@ -0,0 +1,46 @@
+"""
+Authors: Nicholas Learman, Andrew Ballard
+Course: CS 481: Artificial Intelligence, Spring 2025
+Project: Lichess Chess Bot: Minimax with Alpha-Beta Pruning
+"""
+
+import time
+from queue import Empty, SimpleQueue
+from typing import Any, Dict, List, Tuple
+
+
+class EventChannel:
+    """Thread-safe channel for events from the bot and engine threads to the GUI.
+    Any thread may emit; the GUI drains the channel on the Tk thread."""
+
+    def __init__(self, throttle_interval: float = 0.1):
+        self.queue = SimpleQueue()
+        # Minimum seconds between throttled events of the same kind
+        self.throttle_interval = throttle_interval
+        self.last_emitted = {}
+
+    def emit(self, kind: str, **data: Any):
+        """Send an event immediately"""
+        self.queue.put((kind, data))
+
+    def emit_throttled(self, kind: str, **data: Any) -> bool:
+        """Send a high frequency event, dropping it if one of the same kind was sent too recently.
+        Returns whether the event was sent."""
+        now = time.monotonic()
+        if now - self.last_emitted.get(kind, -self.throttle_interval) < (
+            self.throttle_interval
+        ):
+            return False
+        self.last_emitted[kind] = now
+        self.emit(kind, **data)
+        return True
+
+    def drain(self, limit: int = 100) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return up to limit pending events without blocking"""
+        events = []
+        while len(events) < limit:
+            try:
+                events.append(self.queue.get_nowait())
+            except Empty:
+                break
+        return events
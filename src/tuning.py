@@ -0,0 +1,261 @@
+"""
+Authors: Nicholas Learman, Andrew Ballard
+Course: CS 481: Artificial Intelligence, Spring 2025
+Project: Lichess Chess Bot: Minimax with Alpha-Beta Pruning
+
+Offline Texel-style tuning of the MoveEngine evaluation parameters.
+
+Step 1: extract quiet positions and game results from PGN files into a feature matrix
+    python -m src.tuning extract games.pgn [more.pgn ...] --out features.npz
+Step 2: fit the evaluation parameters and export them for MoveEngine to load at startup
+    python -m src.tuning fit features.npz --out src/assets/eval_params.json
+"""
+
+import argparse
+import json
+from array import array
+from typing import Dict, List, Tuple
+
+import chess
+import chess.pgn
+import numpy as np
+
+from src.engine import (
+    DEFAULT_EVAL_PARAMS_PATH,
+    PIECE_VALUES,
+    load_eval_params,
+)
+
+# Piece types with a tunable value; the king is always worth 0
+TUNED_PIECES = [chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN]
+
+# Feature matrix columns: material difference and hanging piece count per piece type, plus positional terms
+MATERIAL_COLUMNS = slice(0, 5)
+MOBILITY_COLUMN = 5
+CASTLING_COLUMN = 6
+HANGING_COLUMNS = slice(7, 12)
+FEATURE_COUNT = 12
+
+GAME_RESULTS = {"1-0": 2, "1/2-1/2": 1, "0-1": 0}  # stored as half points for White
+
+
+def extract_features(board: chess.Board) -> List[int]:
+    """Counts the terms of MoveEngine.evaluate_board from White's perspective, so that
+    evaluation = features . parameters for the current piece values and weights."""
+    features = [0] * FEATURE_COUNT
+
+    for i, piece_type in enumerate(TUNED_PIECES):
+        features[i] = len(board.pieces(piece_type, chess.WHITE)) - len(
+            board.pieces(piece_type, chess.BLACK)
+        )
+
+    mobility = board.legal_moves.count()
+    features[MOBILITY_COLUMN] = mobility if board.turn == chess.WHITE else -mobility
+
+    for color, sign in [(chess.WHITE, 1), (chess.BLACK, -1)]:
+        if board.has_kingside_castling_rights(
+            color
+        ) and board.has_queenside_castling_rights(color):
+            features[CASTLING_COLUMN] += sign
+
+    for square, piece in board.piece_map().items():
+        if piece.piece_type == chess.KING:
+            continue
+        if board.is_attacked_by(piece.color, square) and not board.is_attacked_by(
+            not piece.color, square
+        ):
+            features[HANGING_COLUMNS.start + TUNED_PIECES.index(piece.piece_type)] += 1
+
+    return features
+
+
+def is_quiet(board: chess.Board, last_move: chess.Move) -> bool:
+    """Static evaluation is only meaningful where no tactics are pending"""
+    if board.is_check() or board.is_game_over():
+        return False
+    if last_move.promotion:
+        return False
+    # The move that led here was a capture; a recapture is likely
+    board.pop()
+    was_capture = board.is_capture(last_move)
+    board.push(last_move)
+    return not was_capture
+
+
+def extract(pgn_paths: List[str], out_path: str, skip_plies: int = 8):
+    """Streams games from the PGN files and saves quiet positions and their game results"""
+    features = array("h")
+    results = array("b")
+    games = 0
+
+    for pgn_path in pgn_paths:
+        with open(pgn_path) as pgn:
+            while True:
+                game = chess.pgn.read_game(pgn)
+                if game is None:
+                    break
+                result = GAME_RESULTS.get(game.headers.get("Result"))
+                if result is None:
+                    continue  # unfinished game
+
+                board = game.board()
+                for ply, move in enumerate(game.mainline_moves()):
+                    board.push(move)
+                    # Skip the opening, which is played from the opening book anyway
+                    if ply < skip_plies or not is_quiet(board, move):
+                        continue
+                    features.extend(extract_features(board))
+                    results.append(result)
+
+                games += 1
+                if games % 1000 == 0:
+                    print(f"Extracted {len(results)} positions from {games} games")
+
+    np.savez_compressed(
+        out_path,
+        features=np.frombuffer(features, dtype=np.int16).reshape(-1, FEATURE_COUNT),
+        results=np.frombuffer(results, dtype=np.int8),
+    )
+    print(f"Saved {len(results)} positions from {games} games to {out_path}")
+
+
+def evaluate(
+    features: np.ndarray, piece_values: np.ndarray, weights: np.ndarray
+) -> np.ndarray:
+    """Vectorized evaluate_board; weights are [mobility, castling, hanging]"""
+    return (
+        features[:, MATERIAL_COLUMNS] @ piece_values
+        + weights[0] * features[:, MOBILITY_COLUMN]
+        + weights[1] * features[:, CASTLING_COLUMN]
+        + weights[2] * (features[:, HANGING_COLUMNS] @ piece_values)
+    )
+
+
+def sigmoid(x: np.ndarray) -> np.ndarray:
+    """Logistic function that does not overflow for large evaluations such as mate scores"""
+    return 0.5 * (1 + np.tanh(0.5 * x))
+
+
+def logistic_loss(scores: np.ndarray, results: np.ndarray, k: float) -> float:
+    """Mean cross entropy between predicted win probabilities and game results"""
+    return float(
+        np.mean(
+            results * np.logaddexp(0, -k * scores)
+            + (1 - results) * np.logaddexp(0, k * scores)
+        )
+    )
+
+
+def fit_scale(scores: np.ndarray, results: np.ndarray) -> float:
+    """Finds the scale mapping evaluations (in pawns) to win probabilities for the starting parameters"""
+    candidates = np.geomspace(0.01, 10, 200)
+    losses = [logistic_loss(scores, results, k) for k in candidates]
+    return float(candidates[int(np.argmin(losses))])
+
+
+def fit(
+    features_path: str,
+    out_path: str,
+    epochs: int = 2000,
+    learning_rate: float = 0.01,
+) -> Tuple[Dict, Dict]:
+    """Fits the evaluation parameters with full-batch Adam on the logistic loss and exports them"""
+    data = np.load(features_path)
+    # Column-major so each feature column is contiguous for the vectorized products
+    features = np.asfortranarray(data["features"], dtype=np.float32)
+    results = data["results"].astype(np.float32) / 2
+    print(f"Tuning on {len(results)} positions")
+
+    # Start from the parameters MoveEngine currently uses
+    start_values, start_weights = load_eval_params(DEFAULT_EVAL_PARAMS_PATH)
+    params = np.array(
+        [start_values[p] for p in TUNED_PIECES]
+        + [start_weights[w] for w in ["mobility", "castling", "hanging"]],
+        dtype=np.float32,
+    )
+    trainable = np.ones_like(params)
+    trainable[0] = 0  # pawn stays at 1 so evaluations remain in pawn units
+
+    k = fit_scale(evaluate(features, params[:5], params[5:]), results)
+    start_loss = logistic_loss(evaluate(features, params[:5], params[5:]), results, k)
+    print(f"Scale: {k:.4f}, Starting loss: {start_loss:.6f}")
+
+    m = np.zeros_like(params)
+    v = np.zeros_like(params)
+    beta1, beta2 = 0.9, 0.999
+    for epoch in range(1, epochs + 1):
+        piece_values, weights = params[:5], params[5:]
+        scores = evaluate(features, piece_values, weights)
+        hanging_value = features[:, HANGING_COLUMNS] @ piece_values
+
+        # Gradient of the mean cross entropy with respect to each position's evaluation
+        error = (sigmoid(k * scores) - results) * k / len(results)
+        gradient = np.concatenate(
+            [
+                features[:, MATERIAL_COLUMNS].T @ error
+                + weights[2] * (features[:, HANGING_COLUMNS].T @ error),
+                [
+                    features[:, MOBILITY_COLUMN] @ error,
+                    features[:, CASTLING_COLUMN] @ error,
+                    hanging_value @ error,
+                ],
+            ]
+        )
+        gradient *= trainable
+
+        m = beta1 * m + (1 - beta1) * gradient
+        v = beta2 * v + (1 - beta2) * gradient**2
+        m_hat = m / (1 - beta1**epoch)
+        v_hat = v / (1 - beta2**epoch)
+        params -= learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)
+
+        if epoch % 100 == 0:
+            loss = logistic_loss(scores, results, k)
+            print(f"Epoch {epoch}: loss {loss:.6f}")
+
+    end_loss = logistic_loss(evaluate(features, params[:5], params[5:]), results, k)
+    print(f"Final loss: {end_loss:.6f} (started at {start_loss:.6f})")
+
+    piece_values = {
+        chess.piece_name(p): round(float(params[i]), 4)
+        for i, p in enumerate(TUNED_PIECES)
+    }
+    piece_values["king"] = PIECE_VALUES[chess.KING]
+    weights = dict(start_weights)  # repetition depends on game history and is not tuned
+    for i, name in enumerate(["mobility", "castling", "hanging"]):
+        weights[name] = round(float(params[5 + i]), 4)
+
+    with open(out_path, "w") as f:
+        json.dump({"piece_values": piece_values, "weights": weights}, f, indent=4)
+    print(f"Saved evaluation parameters to {out_path}")
+    return piece_values, weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune MoveEngine evaluation parameters")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract_parser = commands.add_parser(
+        "extract", help="Extract quiet positions from PGN files"
+    )
+    extract_parser.add_argument("pgn", nargs="+", help="PGN files to read")
+    extract_parser.add_argument("--out", default="features.npz")
+    extract_parser.add_argument(
+        "--skip-plies", type=int, default=8, help="Opening plies to ignore per game"
+    )
+
+    fit_parser = commands.add_parser("fit", help="Fit parameters to extracted positions")
+    fit_parser.add_argument("features", help="Feature file written by extract")
+    fit_parser.add_argument("--out", default=DEFAULT_EVAL_PARAMS_PATH)
+    fit_parser.add_argument("--epochs", type=int, default=2000)
+    fit_parser.add_argument("--learning-rate", type=float, default=0.01)
+
+    args = parser.parse_args()
+    if args.command == "extract":
+        extract(args.pgn, args.out, args.skip_plies)
+    else:
+        fit(args.features, args.out, args.epochs, args.learning_rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import chess
+
+from src import analysis
+from src.engine import MoveEngine
+
+
+def analyse(fen, move, depth=2):
+    analysis.init_worker(depth, None)
+    task = {"source": "test.pgn", "game": 0, "ply": 0, "fen": fen, "move": move}
+    return analysis.analyse_position(task)
+
+
+def test_best_move_matches_engine_playing_black():
+    fen = "r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR b KQkq - 3 3"
+    record = analyse(fen, "g7g6")
+
+    engine = MoveEngine(depth=2, verbose=False)
+    board = chess.Board(fen)
+    engine.player_color = board.turn
+    best_move, best_score = engine.search(board)
+
+    assert record["turn"] == "black"
+    assert record["best_move"] == best_move.uci()
+    assert record["eval"] == round(best_score * 100)
+
+
+def test_mate_scores_are_capped():
+    # Qxf7 is mate; the move played misses it
+    fen = "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+    record = analyse(fen, "a2a3")
+
+    assert record["best_move"] == "h5f7"
+    assert record["mate"]
+    assert record["eval"] == analysis.MAX_EVAL_CP
+    assert record["cp_loss"] == analysis.MAX_CP_LOSS
+    assert record["blunder"]
+
+
+def test_load_done_removes_partial_last_line(tmp_path):
+    out_path = tmp_path / "analysis.jsonl"
+    complete = '{"source": "a.pgn", "game": 0, "ply": 0}\n' * 300
+    out_path.write_text(complete + '{"source": "a.pgn", "ga')
+
+    assert analysis.load_done(str(out_path)) == {("a.pgn", 0, 0)}
+    assert out_path.read_text() == complete
@@ -0,0 +1,74 @@
+import os
+
+import chess
+import pytest
+
+from src.engine import MoveEngine
+from src.search_cache import SearchCache
+
+POSITION = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+
+def make_engine(cache=None, depth=3):
+    engine = MoveEngine(depth=depth, cache=cache, verbose=False)
+    engine.player_color = chess.WHITE
+    return engine
+
+
+def test_warm_cache_evaluation_matches_static_evaluation(tmp_path):
+    cache = SearchCache(str(tmp_path / "cache.bin"), size_mb=1)
+    engine = make_engine(cache)
+    board = chess.Board(POSITION)
+    engine.search(board)
+
+    # Positions up to two plies from the root now have search results stored in the cache
+    for move in board.legal_moves:
+        board.push(move)
+        for reply in list(board.legal_moves)[:5]:
+            board.push(reply)
+            assert engine.evaluate_board(board) == pytest.approx(
+                engine.static_evaluation(board), abs=1e-4
+            )
+            board.pop()
+        board.pop()
+    cache.close()
+
+
+def test_repetition_penalty_is_not_shared_through_cache(tmp_path):
+    cache_path = str(tmp_path / "cache.bin")
+    board = chess.Board(POSITION)
+
+    # A game in which many leaf positions have already been seen fills the cache first
+    cache = SearchCache(cache_path, size_mb=1)
+    engine = make_engine(cache)
+    for move in list(board.legal_moves):
+        board.push(move)
+        for reply in list(board.legal_moves)[:3]:
+            board.push(reply)
+            for leaf_move in list(board.legal_moves):
+                board.push(leaf_move)
+                engine.seen_fens.add(board.fen())
+                board.pop()
+            board.pop()
+        board.pop()
+    engine.search(board)
+    cache.close()
+
+    # A new game sharing the cache must search exactly as one without a cache
+    cache = SearchCache(cache_path, size_mb=1)
+    best_move, best_score = make_engine(cache).search(board)
+    expected_move, expected_score = make_engine().search(board)
+    assert best_move == expected_move
+    assert best_score == pytest.approx(expected_score, abs=1e-4)
+    cache.close()
+
+
+def test_new_cache_file_stays_sparse(tmp_path):
+    cache_path = str(tmp_path / "cache.bin")
+    cache = SearchCache(cache_path, size_mb=64)
+    make_engine(cache)  # writes the version header
+    cache.close()
+
+    assert os.path.getsize(cache_path) > 64 * 1024 * 1024
+    if hasattr(os.stat_result, "st_blocks"):
+        assert os.stat(cache_path).st_blocks * 512 < 1024 * 1024